@@ -3,99 +3,187 @@ Custom EIA Data Processing Script for organized_Gen.csv
 Processes Kaggle EIA dataset to extract Solar and Wind generation data
 """
 
-import pandas as pd
+import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from eia_pipeline import (OUTPUT_CSV, OUTPUT_PARQUET, EIASchema, load_cached_result, read_csv_chunks,
+                          save_result, solar_wind_rows, source_types)
+
+# Optional: when polars is installed, organized_Gen.csv is scanned with it instead
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# Chunks being summed in the background while the next one is parsed
+CHUNK_WORKERS = 2
+
+def sum_solar_wind_chunk(chunk, schema):
+    """
+    Sum one chunk by year, producer and source
+    
+    Args:
+        chunk: DataFrame from read_csv_chunks, already filtered by solar_wind_rows
+        schema: EIASchema describing the file
+    """
+    keys = [schema.year_col, schema.type_col, schema.source_col]
+    return chunk.groupby(keys, sort=False, observed=True)[schema.gen_col].sum(min_count=1)
+
+def read_solar_wind_totals_polars(filepath, schema):
+    """
+    Polars version of read_solar_wind_totals, used when polars is installed
+    
+    The whole filter/groupby is one lazy query, so Polars pushes the column
+    selection and filters into the CSV scan and streams through the file,
+    running the groupby on all cores.
+    
+    Args:
+        filepath: Path to organized_Gen.csv
+        schema: EIASchema describing the file
+    """
+    keys = [schema.year_col, schema.type_col, schema.source_col]
+    # Only picks the Solar/Wind rows; which is which is decided later by source_types
+    pattern = '(?i)' + '|'.join(schema.solar_keywords + schema.wind_keywords)
+    
+    # Column types are given up front; Polars would otherwise guess them from the first
+    # rows, and a generation column starting with whole numbers would be read as integers
+    column_types = {schema.year_col: pl.Int16, schema.type_col: pl.String,
+                    schema.source_col: pl.String, schema.gen_col: pl.Float64}
+    
+    totals = (
+        pl.scan_csv(filepath, schema_overrides=column_types)
+        .select(schema.columns)
+        .filter((pl.col(schema.type_col) == schema.producer)
+                & pl.col(schema.source_col).str.contains(pattern))
+        .group_by(keys)
+        .agg(pl.col(schema.gen_col).sum())
+        .sort(schema.year_col, maintain_order=True)
+        .collect(engine='streaming')
+    )
+    return totals.to_pandas()
+
+def read_solar_wind_totals(filepath, schema):
+    """
+    Stream organized_Gen.csv in chunks (parsed by PyArrow) and keep only the rows we need
+    
+    Each chunk is filtered to the schema's producer and Solar/Wind rows in
+    Arrow as it is read (by solar_wind_rows), then summed by year, producer and
+    source on a worker thread while the next chunk is being parsed. At most
+    CHUNK_WORKERS chunks wait to be summed, so the full file is never held in
+    memory at once. The text columns are loaded as categories, so the string
+    matching only runs on their few distinct values, and generation as float32
+    to halve the data scanned. The per-chunk sums are small, so they are
+    combined in float64.
+    
+    Args:
+        filepath: Path to organized_Gen.csv
+        schema: EIASchema describing the file
+    """
+    if pl is not None:
+        return read_solar_wind_totals_polars(filepath, schema)
+    
+    keys = [schema.year_col, schema.type_col, schema.source_col]
+    dtypes = {schema.year_col: 'int16', schema.type_col: 'category', schema.source_col: 'category',
+              schema.gen_col: 'float32'}
+    
+    # Rows outside the producer and Solar/Wind sources are dropped in Arrow, as in eia_pipeline
+    row_filter = functools.partial(solar_wind_rows, schema=schema)
+    
+    parts = []
+    pending = []
+    with ThreadPoolExecutor(max_workers=CHUNK_WORKERS) as executor:
+        for chunk in read_csv_chunks(filepath, schema.columns, dtypes, row_filter):
+            pending.append(executor.submit(sum_solar_wind_chunk, chunk, schema))
+            
+            # Don't read further ahead than the workers can keep up with
+            if len(pending) >= CHUNK_WORKERS:
+                parts.append(pending.pop(0).result())
+        
+        parts.extend(future.result() for future in pending)
+    
+    # Combine the per-chunk partial sums, then sort by year once so the
+    # yearly groupbys downstream can skip sorting
+    totals = pd.concat(parts).astype('float64').groupby(level=keys, sort=False, observed=True).sum().reset_index()
+    return totals.sort_values(schema.year_col, kind='stable', ignore_index=True)
 
-def process_organized_gen_file(filepath):
+def process_organized_gen_file(filepath, schema=EIASchema()):
     """
     Process the organized_Gen.csv file from Kaggle
     
+    Runs start to finish without prompting; the column names, filters and
+    unit conversion all come from the schema.
+    
     Args:
         filepath: Path to organized_Gen.csv
+        schema: EIASchema describing the file and how to process it
     """
     print("📂 Loading organized_Gen.csv...")
     
     try:
-        # Read the CSV file
-        df = pd.read_csv(filepath)
-        
+        # Reuse the previous result if the source file hasn't changed
+        cached_df = load_cached_result(filepath, schema)
+        if cached_df is not None:
+            print(f"✅ Source file unchanged, using cached result: {OUTPUT_PARQUET}")
+            print(cached_df)
+            return cached_df
+        
+        # Stream the CSV file, keeping only Solar/Wind totals
+        df = read_solar_wind_totals(filepath, schema)
+        
+        # Rows outside the producer and Solar/Wind sources were dropped while reading,
+        # so what's shown here are the yearly totals, not the file's own rows
         print(f"✅ File loaded successfully!")
-        print(f"Shape: {df.shape}")
+        print(f"Yearly totals by producer and source: {len(df)}")
         print(f"\nColumns: {df.columns.tolist()}")
-        print(f"\nFirst few rows:")
+        print(f"\nFirst few totals:")
         print(df.head())
         
-        # Check what energy types are available
+        # Check which Solar/Wind sources were matched
         print("\n" + "="*70)
-        print("AVAILABLE ENERGY TYPES:")
+        print("MATCHED SOLAR/WIND SOURCES:")
         print("="*70)
-        energy_types = df['TYPE OF PRODUCER'].unique() if 'TYPE OF PRODUCER' in df.columns else df.iloc[:, 3].unique()
+        energy_types = df[schema.source_col].unique()
         for i, energy_type in enumerate(energy_types[:20], 1):  # Show first 20
             print(f"  {i}. {energy_type}")
         
         if len(energy_types) > 20:
             print(f"  ... and {len(energy_types) - 20} more")
         
-        # Identify the correct column names
+        # Split the totals into Solar and Wind
         print("\n" + "="*70)
-        print("COLUMN IDENTIFICATION:")
+        print("SPLITTING SOLAR AND WIND:")
         print("="*70)
         
-        # Try to auto-detect columns
-        year_col = 'YEAR' if 'YEAR' in df.columns else df.columns[0]
-        type_col = 'TYPE OF PRODUCER' if 'TYPE OF PRODUCER' in df.columns else df.columns[3]
-        gen_col = 'ENERGY SOURCE' if 'ENERGY SOURCE' in df.columns else df.columns[4]
-        
-        # Check if column names match what we see
-        if 'GENERATION' in str(df.columns[-1]).upper():
-            gen_col = df.columns[-1]
-        
-        print(f"Auto-detected columns:")
-        print(f"  Year column: {year_col}")
-        print(f"  Energy type column: {type_col}")
-        print(f"  Generation column: {gen_col}")
-        
-        confirm = input("\nAre these correct? (yes/no): ").lower()
-        
-        if confirm != 'yes':
-            print("\nPlease specify the column names:")
-            year_col = input("Enter YEAR column name: ").strip()
-            type_col = input("Enter ENERGY TYPE column name: ").strip()
-            gen_col = input("Enter GENERATION column name: ").strip()
-        
-        # Filter for Solar and Wind
-        print("\n" + "="*70)
-        print("FILTERING DATA:")
-        print("="*70)
-        
-        # Common patterns for solar and wind in EIA data
-        solar_keywords = ['solar', 'photovoltaic', 'pv', 'sun']
-        wind_keywords = ['wind']
+        # Classify each distinct source name once (the same way the row filter does),
+        # then select rows by category code
+        sources = df[schema.source_col].astype('category')
+        energy_types = source_types(sources.cat.categories, schema)
+        solar_codes = np.flatnonzero(energy_types == 'Solar')
+        wind_codes = np.flatnonzero(energy_types == 'Wind')
         
         # Find solar entries
-        solar_mask = df[type_col].str.lower().str.contains('|'.join(solar_keywords), na=False)
+        solar_mask = np.isin(sources.cat.codes.to_numpy(), solar_codes)
         solar_data = df[solar_mask].copy()
         
-        print(f"Found {len(solar_data)} rows with Solar data")
+        print(f"Found {len(solar_data)} yearly totals with Solar data")
         if len(solar_data) > 0:
-            print(f"Solar types found: {solar_data[type_col].unique()}")
+            print(f"Solar types found: {solar_data[schema.source_col].unique().tolist()}")
         
         # Find wind entries
-        wind_mask = df[type_col].str.lower().str.contains('|'.join(wind_keywords), na=False)
+        wind_mask = np.isin(sources.cat.codes.to_numpy(), wind_codes)
         wind_data = df[wind_mask].copy()
         
-        print(f"Found {len(wind_data)} rows with Wind data")
+        print(f"Found {len(wind_data)} yearly totals with Wind data")
         if len(wind_data) > 0:
-            print(f"Wind types found: {wind_data[type_col].unique()}")
+            print(f"Wind types found: {wind_data[schema.source_col].unique().tolist()}")
         
         if len(solar_data) == 0 or len(wind_data) == 0:
-            print("\n⚠️ Warning: Could not auto-detect Solar or Wind data")
-            print("Please specify the exact text in the TYPE column:")
-            solar_text = input("Enter the exact text for SOLAR (e.g., 'Solar Thermal and Photovoltaic'): ").strip()
-            wind_text = input("Enter the exact text for WIND (e.g., 'Wind'): ").strip()
-            
-            solar_data = df[df[type_col] == solar_text].copy()
-            wind_data = df[df[type_col] == wind_text].copy()
+            raise ValueError(f"Could not find Solar or Wind data in '{schema.source_col}' - "
+                             f"check the keywords in EIASchema")
         
         # Aggregate by year
         print("\n" + "="*70)
@@ -103,60 +191,47 @@ def process_organized_gen_file(filepath):
         print("="*70)
         
         # Group by year and sum generation
-        solar_yearly = solar_data.groupby(year_col)[gen_col].sum().reset_index()
-        solar_yearly.columns = ['Year', 'Solar_Generation']
+        solar_yearly = solar_data.groupby(schema.year_col, sort=False)[schema.gen_col].sum()
+        wind_yearly = wind_data.groupby(schema.year_col, sort=False)[schema.gen_col].sum()
         
-        wind_yearly = wind_data.groupby(year_col)[gen_col].sum().reset_index()
-        wind_yearly.columns = ['Year', 'Wind_Generation']
-        
-        # Merge solar and wind data
-        result_df = pd.merge(solar_yearly, wind_yearly, on='Year', how='outer')
-        result_df = result_df.sort_values('Year')
+        # Line up solar and wind on the (sorted) union of their years
+        years = np.union1d(solar_yearly.index, wind_yearly.index)
+        result_df = pd.DataFrame({
+            'Year': years,
+            'Solar_Generation': solar_yearly.reindex(years).to_numpy(),
+            'Wind_Generation': wind_yearly.reindex(years).to_numpy()
+        })
         
         print(f"Aggregated to {len(result_df)} years")
         print(f"Year range: {result_df['Year'].min()} to {result_df['Year'].max()}")
         
-        # Check units and convert if needed
+        # Convert units
         print("\n" + "="*70)
         print("UNIT CONVERSION:")
         print("="*70)
-        print("Sample values:")
-        print(result_df.head())
-        
-        unit_question = input("\nAre these values in MWh (megawatt-hours)? (yes/no): ").lower()
+        print(f"Dividing by {schema.divisor:,.0f}")
         
-        if unit_question == 'yes':
-            # Convert MWh to TWh (divide by 1,000,000 or 1000 depending on format)
-            conversion = input("Divide by 1000 or 1000000? (usually 1000): ").strip()
-            divisor = float(conversion) if conversion else 1000
-            
-            result_df['Solar_TWh'] = result_df['Solar_Generation'] / divisor
-            result_df['Wind_TWh'] = result_df['Wind_Generation'] / divisor
-        else:
-            result_df['Solar_TWh'] = result_df['Solar_Generation']
-            result_df['Wind_TWh'] = result_df['Wind_Generation']
+        # Convert both columns in one array and assign them as one block
+        generation = result_df[['Solar_Generation', 'Wind_Generation']].to_numpy()
+        result_df[['Solar_TWh', 'Wind_TWh']] = generation / schema.divisor
         
-        # Filter to 2014-2024
-        filter_years = input("\nFilter to years 2014-2024 only? (yes/no): ").lower()
-        if filter_years == 'yes':
-            result_df = result_df[(result_df['Year'] >= 2014) & (result_df['Year'] <= 2024)]
-            print(f"✅ Filtered to {len(result_df)} rows (2014-2024)")
+        # Filter to the schema's year range
+        if schema.year_range is not None:
+            first_year, last_year = schema.year_range
+            result_df = result_df[(result_df['Year'] >= first_year) & (result_df['Year'] <= last_year)]
+            print(f"✅ Filtered to {len(result_df)} rows ({first_year}-{last_year})")
         
         # Final dataset
         final_df = result_df[['Year', 'Solar_TWh', 'Wind_TWh']].copy()
-        final_df = final_df.sort_values('Year').reset_index(drop=True)
-        
-        # Create data directory
-        os.makedirs('data', exist_ok=True)
+        final_df = final_df.reset_index(drop=True)
         
         # Save processed data
-        output_path = 'data/eia_renewable_data.csv'
-        final_df.to_csv(output_path, index=False)
+        save_result(final_df, filepath, schema)
         
         print("\n" + "="*70)
         print("✅ SUCCESS!")
         print("="*70)
-        print(f"Processed data saved to: {output_path}")
+        print(f"Processed data saved to: {OUTPUT_CSV} and {OUTPUT_PARQUET}")
         print(f"\nFinal dataset:")
         print(final_df)
         print(f"\nStats:")
@@ -184,14 +259,10 @@ def create_sample_data():
     
     df = pd.DataFrame(data)
     
-    # Create data directory
-    os.makedirs('data', exist_ok=True)
-    
-    # Save to CSV
-    output_path = 'data/eia_renewable_data.csv'
-    df.to_csv(output_path, index=False)
+    # Save to CSV and Parquet
+    save_result(df)
     
-    print(f"✅ Sample dataset created: {output_path}")
+    print(f"✅ Sample dataset created: {OUTPUT_CSV}")
     print(f"\nDataset Preview:")
     print(df)
     
@@ -237,8 +308,8 @@ def main():
     print("✅ SETUP COMPLETE!")
     print("="*70)
     print("\nNext steps:")
-    print("1. Run your Streamlit app: streamlit run energy_analysis_app.py")
-    print("2. Your app will load data from: data/eia_renewable_data.csv")
+    print("1. Run your Streamlit app: streamlit run energy_app.py")
+    print(f"2. Your app will load data from: {OUTPUT_PARQUET} (or {OUTPUT_CSV})")
     print("\n")
 
 if __name__ == "__main__":
@@ -0,0 +1,276 @@
+"""
+Shared EIA pipeline for the processing scripts (data_collection_script.py,
+check_data.py and process_organized_gen.py): the file schema, chunked CSV
+reading, the saved outputs and their cache, and the shared Solar/Wind load
+"""
+
+import functools
+import json
+import os
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+# Bytes of CSV parsed per chunk
+CHUNK_BYTES = 64 * 1024 * 1024
+
+@dataclass(frozen=True)
+class EIASchema:
+    """
+    Describes the organized_Gen.csv layout and how to process it
+
+    Everything the processor used to ask for interactively lives here, so a
+    file can be processed in one go without any prompts.
+    """
+    year_col: str = 'YEAR'
+    type_col: str = 'TYPE OF PRODUCER'
+    source_col: str = 'ENERGY SOURCE'
+    gen_col: str = 'GENERATION (Megawatthours)'
+
+    # Only this producer is kept, to avoid double-counting
+    producer: str = 'Total Electric Power Industry'
+
+    # Common patterns for solar and wind in EIA data
+    solar_keywords: tuple = ('solar', 'photovoltaic', 'pv', 'sun')
+    wind_keywords: tuple = ('wind',)
+
+    # MWh -> TWh (1 Terawatt-hour = 1,000,000 Megawatt-hours)
+    divisor: float = 1_000_000
+
+    # Inclusive (first, last) years to keep, or None for all years
+    year_range: tuple = (2014, 2024)
+
+    @property
+    def columns(self):
+        """Columns used by the pipeline; everything else is skipped while parsing"""
+        return [self.year_col, self.type_col, self.source_col, self.gen_col]
+
+# Processed outputs: CSV for reading by hand, Parquet for the app and as a cache
+OUTPUT_CSV = 'data/eia_renewable_data.csv'
+OUTPUT_PARQUET = 'data/eia_renewable_data.parquet'
+OUTPUT_META = 'data/eia_renewable_data.meta.json'
+
+def source_key(filepath, schema):
+    """
+    Identify a version of the source file by its modification time and size,
+    together with the schema used to process it
+    """
+    stat = os.stat(filepath)
+    key = {'mtime': stat.st_mtime, 'size': stat.st_size, 'schema': asdict(schema)}
+
+    # Round-trip through JSON so it compares equal to what was saved (tuples become lists)
+    return json.loads(json.dumps(key))
+
+def load_cached_result(filepath, schema):
+    """
+    Return the saved Parquet result if it was built from this exact version
+    of the source file with the same schema, otherwise None
+
+    Args:
+        filepath: Path to organized_Gen.csv
+        schema: EIASchema the result should have been built with
+    """
+    if not (os.path.exists(OUTPUT_PARQUET) and os.path.exists(OUTPUT_META)):
+        return None
+
+    with open(OUTPUT_META) as f:
+        if json.load(f) != source_key(filepath, schema):
+            return None
+
+    return pd.read_parquet(OUTPUT_PARQUET, engine='pyarrow')
+
+def save_result(df, filepath=None, schema=None):
+    """
+    Save the processed dataset as CSV and Parquet
+
+    Args:
+        df: Processed dataset (Year, Solar_TWh, Wind_TWh)
+        filepath: Source file the dataset was built from. Its mtime and size are
+            recorded with the schema so an unchanged source can be served from
+            the cache next time. Leave as None for data that didn't come from a
+            source file.
+        schema: EIASchema the dataset was built with (required with filepath)
+    """
+    os.makedirs('data', exist_ok=True)
+
+    df.to_csv(OUTPUT_CSV, index=False)
+    df.to_parquet(OUTPUT_PARQUET, engine='pyarrow', index=False, compression='zstd')
+
+    if filepath is not None:
+        with open(OUTPUT_META, 'w') as f:
+            json.dump(source_key(filepath, schema), f)
+    elif os.path.exists(OUTPUT_META):
+        os.remove(OUTPUT_META)
+
+def read_csv_chunks(filepath, columns, dtypes, row_filter=None):
+    """
+    Stream a CSV file as pandas DataFrames, parsed block by block with PyArrow
+
+    Args:
+        filepath: Path to the CSV file
+        columns: Columns to parse; all others are skipped
+        dtypes: Pandas dtype for each column. 'category' columns are
+            dictionary-encoded by Arrow and arrive as pandas categoricals.
+        row_filter: Optional function taking each PyArrow RecordBatch and returning
+            a boolean mask. Rows it rejects are dropped in Arrow, before pandas sees them.
+    """
+    column_types = {
+        col: pa.dictionary(pa.int32(), pa.string()) if dtype == 'category' else pa.from_numpy_dtype(np.dtype(dtype))
+        for col, dtype in dtypes.items()
+    }
+    reader = pacsv.open_csv(
+        filepath,
+        read_options=pacsv.ReadOptions(block_size=CHUNK_BYTES),
+        convert_options=pacsv.ConvertOptions(include_columns=columns, column_types=column_types)
+    )
+
+    for batch in reader:
+        if row_filter is not None:
+            batch = batch.filter(row_filter(batch))
+        yield batch.to_pandas()
+
+# What check_data.py and process_organized_gen.py compute: "solar"/"wind" sources
+# from the "Total Electric Power Industry", every year (scripts narrow the years themselves)
+SCHEMA = EIASchema(solar_keywords=('solar',), year_range=None)
+
+def source_types(names, schema):
+    """
+    Label each source name 'Wind', 'Solar' or None from the schema's keywords
+
+    The one place sources are classified, so filtering and labelling always agree.
+    Matching ignores case; a name matching both keyword lists counts as Wind.
+
+    Args:
+        names: Source names (a short list of distinct values, e.g. categories)
+        schema: EIASchema with the keywords
+    """
+    names = pa.array(names, type=pa.string())
+    is_wind = pc.match_substring_regex(names, '|'.join(schema.wind_keywords), ignore_case=True)
+    is_solar = pc.match_substring_regex(names, '|'.join(schema.solar_keywords), ignore_case=True)
+    return np.where(is_wind.fill_null(False).to_numpy(zero_copy_only=False), 'Wind',
+                    np.where(is_solar.fill_null(False).to_numpy(zero_copy_only=False), 'Solar', None))
+
+def solar_wind_rows(batch, schema):
+    """
+    Mask of the rows from the schema's producer with a Solar or Wind source,
+    for read_csv_chunks' row_filter
+
+    Both columns are dictionary-encoded, so the string checks run once on each
+    dictionary and are then spread to the rows by their indices.
+
+    Args:
+        batch: PyArrow RecordBatch read with the producer and source as categories
+        schema: EIASchema describing the file
+    """
+    producer = batch.column(schema.type_col)
+    source = batch.column(schema.source_col)
+
+    is_producer = pc.take(pc.equal(producer.dictionary, schema.producer), producer.indices)
+    is_solar_wind = pc.take(pa.array(pd.notna(source_types(source.dictionary, schema))), source.indices)
+    return pc.and_(is_producer, is_solar_wind)
+
+@functools.lru_cache(maxsize=4)
+def _load(path, mtime, schema):
+    """
+    Parse the file once and keep only the Solar/Wind rows of the schema's producer
+
+    Cached on (path, mtime, schema), so inspecting and building from the same
+    file reuses one parse, and a changed file is parsed again.
+    """
+    # The two text columns only hold a handful of distinct values, so they are loaded as
+    # categories (small int codes) instead of one Python string per row
+    # Generation is read as float32 to halve the bytes scanned; yearly sums go back to float64
+    dtypes = {schema.year_col: 'int16', schema.type_col: 'category', schema.source_col: 'category',
+              schema.gen_col: 'float32'}
+
+    # Stream the file in chunks (parsed by PyArrow) and filter each one in Arrow as it is read,
+    # so the discarded rows never become pandas objects:
+    # - Keep only the "Total Electric Power Industry" to capture the aggregate data
+    #   (The diagnostic showed this is the first value in 'TYPE OF PRODUCER')
+    # - Keep only Solar and Wind sources
+    row_filter = functools.partial(solar_wind_rows, schema=schema)
+    parts = []
+    for chunk in read_csv_chunks(path, schema.columns, dtypes, row_filter):
+        # Label each energy source category as 'Solar' or 'Wind', then tag the rows
+        # We use string search because Solar might be named "Solar Thermal and Photovoltaic"
+        energy_types = source_types(chunk[schema.source_col].cat.categories, schema)
+        codes = chunk[schema.source_col].cat.codes.to_numpy()
+        parts.append(chunk.assign(Energy_Type=energy_types[codes]))
+
+    # A file with only a header has no chunks at all: return no rows rather than fail
+    if not parts:
+        empty = {col: pd.Series(dtype=dtype) for col, dtype in dtypes.items()}
+        return pd.DataFrame(empty).assign(Energy_Type=pd.Series(dtype=object))
+
+    return pd.concat(parts, ignore_index=True)
+
+def load(path, schema=SCHEMA):
+    """
+    Solar/Wind rows of organized_Gen.csv, parsed at most once per file version
+
+    Args:
+        path: Path to organized_Gen.csv
+        schema: EIASchema describing the file
+    """
+    return _load(path, os.path.getmtime(path), schema)
+
+def inspect(path, schema=SCHEMA):
+    """
+    Print what was found in the file: row counts and the matching source names
+
+    Args:
+        path: Path to organized_Gen.csv
+        schema: EIASchema describing the file
+    """
+    df = load(path, schema)
+
+    print(f"Found {len(df)} Solar/Wind rows from '{schema.producer}'")
+    for energy_type in ['Solar', 'Wind']:
+        rows = df[df['Energy_Type'] == energy_type]
+        print(f"Found {len(rows)} {energy_type} rows")
+        if len(rows) > 0:
+            print(f"{energy_type} energy sources: {rows[schema.source_col].unique().tolist()}")
+
+def build(path, schema=SCHEMA):
+    """
+    Yearly Solar and Wind generation in TWh (Year, Solar_TWh, Wind_TWh)
+
+    Args:
+        path: Path to organized_Gen.csv
+        schema: EIASchema describing the file and the years to keep
+    """
+    df = load(path, schema)
+
+    # Sum the Generation per (Year, Energy_Type) pair in one pass, one column per type
+    # (Aggregating all states and months into one yearly total)
+    # Each pair gets an integer key; after a sort, equal keys are contiguous and np.add.reduceat
+    # sums every run at once. Missing generation counts as 0, like a pandas sum skipping NaN
+    is_solar = df['Energy_Type'].to_numpy() == 'Solar'
+    keys = df[schema.year_col].to_numpy(dtype='int64') * 2 + is_solar
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    gen = np.nan_to_num(df[schema.gen_col].to_numpy(dtype='float64')[order])
+
+    starts = np.flatnonzero(np.diff(keys, prepend=-1))
+    sums = np.add.reduceat(gen, starts)
+    pair_years, pair_is_solar = np.divmod(keys[starts], 2)
+
+    # One row per year (sorted), Solar in column 0 and Wind in column 1; a missing pair stays 0
+    years = np.unique(pair_years)
+    table = np.zeros((len(years), 2))
+    table[np.searchsorted(years, pair_years), 1 - pair_is_solar] = sums
+
+    # Convert MWh to TWh (1 Terawatt-hour = 1,000,000 Megawatt-hours)
+    # and name the columns to match the app's expected output
+    table = table / schema.divisor
+    pivot_df = pd.DataFrame({'Year': years, 'Solar_TWh': table[:, 0], 'Wind_TWh': table[:, 1]})
+
+    if schema.year_range is not None:
+        first_year, last_year = schema.year_range
+        pivot_df = pivot_df[(pivot_df['Year'] >= first_year) & (pivot_df['Year'] <= last_year)]
+
+    return pivot_df.reset_index(drop=True)
@@ -1,10 +1,10 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
 
+import views
+
 # Set page configuration
 st.set_page_config(
     page_title="Powering Forward - Energy Analysis",
@@ -16,64 +16,157 @@ st.set_page_config(
 st.title(" Powering Forward: U.S. Energy Growth Analysis")
 st.write("Analyzing renewable energy trends from EIA data")
 
-# LOAD DATA - REAL CSV ONLY
-@st.cache_data
-def load_data():
-    """Load ONLY from CSV - no sample data fallback"""
-    csv_path = 'data/eia_renewable_data.csv'
-    
-    # Check if file exists
-    if not os.path.exists(csv_path):
-        st.error(f"❌ CSV file not found at: {csv_path}")
+# LOAD DATA - REAL DATA ONLY
+PARQUET_PATH = 'data/eia_renewable_data.parquet'
+CSV_PATH = 'data/eia_renewable_data.csv'
+
+# Part of the side pickle's name; bump it whenever load_data() changes what it returns,
+# so pickles written by older code are never served
+PICKLE_VERSION = 2
+
+def find_data_file():
+    """Path of the processed data - the newer of the Parquet and CSV files. No sample data fallback"""
+    existing = [path for path in (PARQUET_PATH, CSV_PATH) if os.path.exists(path)]
+    if not existing:
+        st.error(f"❌ Data file not found at: {PARQUET_PATH} or {CSV_PATH}")
         st.error("Please run the data processing script first!")
         st.stop()
     
-    # Read CSV
-    df = pd.read_csv(csv_path)
-    
-    # Validate data
+    # The processing scripts write both files together, but only the CSV is committed, so
+    # a pulled CSV can be newer than a local Parquet: use whichever file is newer
+    # (Parquet wins a tie, it loads faster than CSV)
+    return max(existing, key=os.path.getmtime)
+
+@st.cache_data(ttl=None, show_spinner=False)
+def load_data(data_path, mtime):
+    """Load the processed data file (mtime is part of the cache key, so a changed file is reloaded)"""
+    # The finished table from the last parse is pickled next to the data file, so a fresh
+    # Streamlit process skips parsing as long as the data file hasn't changed since
+    pickle_path = f'{data_path}.v{PICKLE_VERSION}.pkl'
+    if os.path.exists(pickle_path) and os.path.getmtime(pickle_path) >= os.path.getmtime(data_path):
+        # An unreadable pickle (corrupt, or written by another pandas version) is just
+        # ignored: the data file is parsed below and the pickle rewritten
+        try:
+            return pd.read_pickle(pickle_path)
+        except Exception:
+            pass
+    
+    # Only the three columns the app uses are read, with their types given up front
     required_cols = ['Year', 'Solar_TWh', 'Wind_TWh']
-    missing_cols = [col for col in required_cols if col not in df.columns]
-    if missing_cols:
+    try:
+        if data_path == PARQUET_PATH:
+            df = pd.read_parquet(data_path, engine='pyarrow', columns=required_cols)
+        else:
+            df = pd.read_csv(data_path, usecols=required_cols, engine='pyarrow',
+                             dtype={'Year': 'int32', 'Solar_TWh': 'float64', 'Wind_TWh': 'float64'})
+    except (KeyError, ValueError):
+        # Validate data (the header is only read again here, to name what is missing)
+        if data_path == PARQUET_PATH:
+            columns = pd.read_parquet(data_path, engine='pyarrow').columns
+        else:
+            columns = pd.read_csv(data_path, nrows=0).columns
+        missing_cols = [col for col in required_cols if col not in columns]
+        if not missing_cols:
+            raise
         st.error(f"❌ Missing required columns: {missing_cols}")
         st.stop()
     
-    # Calculate additional columns
-    df['Total_Renewable'] = df['Solar_TWh'] + df['Wind_TWh']
-    df['Solar_YoY_Growth'] = df['Solar_TWh'].pct_change() * 100
-    df['Wind_YoY_Growth'] = df['Wind_TWh'].pct_change() * 100
+    # Sort by Year once here, so row 0 is always the first year and row -1 the last
+    # (The YoY growth relies on this, and so do the first/last-year lookups below)
+    df = df.sort_values('Year', ignore_index=True)
+    
+    # Calculate additional columns on both series at once
+    values = df[['Solar_TWh', 'Wind_TWh']].to_numpy(dtype=float)
+    yoy = np.empty_like(values)
+    yoy[0] = np.nan
+    # A zero year gives inf/NaN growth, as pct_change did, without NumPy warning about it
+    with np.errstate(divide='ignore', invalid='ignore'):
+        yoy[1:] = (values[1:] / values[:-1] - 1) * 100
+    
+    df['Total_Renewable'] = values.sum(axis=1)
+    df[['Solar_YoY_Growth', 'Wind_YoY_Growth']] = yoy
+    
+    # Written to a temporary file and renamed into place, so a reader never sees half a pickle
+    # The pickle is only a speed-up: if data/ can't be written to, the app carries on without it
+    tmp_path = f'{pickle_path}.{os.getpid()}.tmp'
+    try:
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, pickle_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
     
     return df
 
 # Load the data
-df = load_data()
+data_path = find_data_file()
+data_version = (data_path, os.path.getmtime(data_path))
+df = load_data(*data_version)
+
+# Calculate the growth metrics once per dataset (a cached dict, not recomputed on every rerun)
+@st.cache_data(show_spinner=False)
+def compute_metrics(df):
+    """First/last years, start/end values, CAGR and total growth for Solar and Wind (arrays in that order)"""
+    # Solar and wind go through the same math, so compute both at once on one NumPy array
+    values = df[['Solar_TWh', 'Wind_TWh']].to_numpy()
+    years = (int(df['Year'].iat[0]), int(df['Year'].iat[-1]))
+    num_years = years[1] - years[0]
+    
+    # A zero start makes the ratios below inf/NaN; they're shown as "n/a", so skip the warnings
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # CAGR - Compound Annual Growth Rate (%)
+        # (Undefined for a single year of data, so it's left as NaN and shown as "n/a")
+        if num_years > 0:
+            cagr = ((values[-1] / values[0]) ** (1.0 / num_years) - 1.0) * 100.0
+        else:
+            cagr = np.full(2, np.nan)
+        # Total growth over the whole period (%)
+        total_growth = (values[-1] / values[0] - 1) * 100
+    
+    # The same numbers show up in several places on the page, so they're formatted here once
+    def pct(value, decimals):
+        return f"{value:.{decimals}f}%" if np.isfinite(value) else "n/a"
+    
+    fmt = {'cagr_difference': pct(cagr[0] - cagr[1], 2)}
+    for name, start, end, rate, growth in zip(['solar', 'wind'], values[0], values[-1], cagr, total_growth):
+        fmt[f'{name}_start'] = f"{start:.1f}"
+        fmt[f'{name}_end'] = f"{end:.1f}"
+        fmt[f'{name}_delta'] = f"+{end - start:.1f} TWh"
+        fmt[f'{name}_cagr'] = pct(rate, 2)
+        fmt[f'{name}_cagr_short'] = pct(rate, 1)
+        fmt[f'{name}_growth'] = f"{growth:.0f}%"
+    
+    return {
+        'start': values[0],
+        'end': values[-1],
+        'years': years,
+        'num_years': num_years,
+        'cagr': cagr,
+        'total_growth': total_growth,
+        'fmt': fmt,
+    }
+
+# Everything the tabs need comes from this one dict, kept in the session so widget-only reruns
+# reuse it; it's only recomputed when the data file changes
+if st.session_state.get('metrics_version') != data_version:
+    st.session_state['metrics'] = compute_metrics(df)
+    st.session_state['metrics_version'] = data_version
+metrics = st.session_state['metrics']
+fmt = metrics['fmt']
+num_years = metrics['num_years']
+start_year, end_year = metrics['years']
 
 # Show data info in sidebar
 st.sidebar.write("### Dataset Info")
-st.sidebar.write(f" Years: {df['Year'].min()} - {df['Year'].max()}")
+st.sidebar.write(f" Years: {start_year} - {end_year}")
 st.sidebar.write(f" {len(df)} Years of Data")
-st.sidebar.write(f" Solar start: {df['Solar_TWh'].iloc[0]:.1f} TWh")
-st.sidebar.write(f" Wind start: {df['Wind_TWh'].iloc[0]:.1f} TWh")
+st.sidebar.write(f" Solar start: {fmt['solar_start']} TWh")
+st.sidebar.write(f" Wind start: {fmt['wind_start']} TWh")
 
 # Update the header with actual date range
-st.write(f"**Data:** U.S. Energy Information Administration (EIA) via Kaggle | **Years:** {df['Year'].min()}-{df['Year'].max()}")
+st.write(f"**Data:** U.S. Energy Information Administration (EIA) via Kaggle | **Years:** {start_year}-{end_year}")
 st.write("---")
 
-# Calculate CAGR
-def calculate_cagr(start_value, end_value, num_years):
-    """Calculate Compound Annual Growth Rate"""
-    cagr = (end_value / start_value) ** (1 / num_years) - 1
-    return cagr * 100
-
-solar_start = df['Solar_TWh'].iloc[0]
-solar_end = df['Solar_TWh'].iloc[-1]
-wind_start = df['Wind_TWh'].iloc[0]
-wind_end = df['Wind_TWh'].iloc[-1]
-num_years = df['Year'].iloc[-1] - df['Year'].iloc[0]
-
-solar_cagr = calculate_cagr(solar_start, solar_end, num_years)
-wind_cagr = calculate_cagr(wind_start, wind_end, num_years)
-
 # Key Metrics Row
 st.subheader("Key Growth Metrics")
 
@@ -82,23 +175,23 @@ col1, col2, col3 = st.columns(3)
 with col1:
     st.metric(
         label=f" Solar CAGR",
-        value=f"{solar_cagr:.2f}%",
-        delta=f"+{solar_end - solar_start:.1f} TWh"
+        value=fmt['solar_cagr'],
+        delta=fmt['solar_delta']
     )
-    st.caption(f"{solar_start:.1f} → {solar_end:.1f} TWh ({num_years} years)")
+    st.caption(f"{fmt['solar_start']} → {fmt['solar_end']} TWh ({num_years} years)")
 
 with col2:
     st.metric(
         label=f" Wind CAGR",
-        value=f"{wind_cagr:.2f}%",
-        delta=f"+{wind_end - wind_start:.1f} TWh"
+        value=fmt['wind_cagr'],
+        delta=fmt['wind_delta']
     )
-    st.caption(f"{wind_start:.1f} → {wind_end:.1f} TWh ({num_years} years)")
+    st.caption(f"{fmt['wind_start']} → {fmt['wind_end']} TWh ({num_years} years)")
 
 with col3:
     st.metric(
         label=" Difference",
-        value=f"{solar_cagr - wind_cagr:.2f}%"
+        value=fmt['cagr_difference']
     )
     st.caption("Solar growing faster")
 
@@ -112,147 +205,17 @@ tab1, tab2, tab3, tab4 = st.tabs([
     "Raw Data"
 ])
 
-# Tab 1: Generation Overview
 with tab1:
-    st.write("### Energy Generation Trends")
-    st.write(f"Looking at how solar and wind generation changed from {df['Year'].min()} to {df['Year'].max()}")
-    
-    # Set style
-    sns.set_style("whitegrid")
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    # Plot lines
-    ax.plot(df['Year'], df['Solar_TWh'], marker='o', linewidth=3, 
-            label='Solar', color='#ff8c00', markersize=8)
-    ax.plot(df['Year'], df['Wind_TWh'], marker='s', linewidth=3, 
-            label='Wind', color='#1f77b4', markersize=8)
-    ax.plot(df['Year'], df['Total_Renewable'], marker='^', linewidth=2, 
-            label='Total Renewable', color='#2ca02c', markersize=6, 
-            linestyle='--', alpha=0.7)
-    
-    # Styling
-    ax.set_xlabel('Year', fontsize=12)
-    ax.set_ylabel('Energy Generation (TWh)', fontsize=12)
-    ax.set_title('Solar vs Wind Generation', fontsize=14, pad=15)
-    ax.legend(fontsize=11, loc='upper left')
-    ax.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    st.pyplot(fig)
-    
-    st.write(f"**Note:** Solar grew from {solar_start:.1f} TWh to {solar_end:.1f} TWh (a {((solar_end/solar_start - 1)*100):.0f}% increase), while wind went from {wind_start:.1f} TWh to {wind_end:.1f} TWh ({((wind_end/wind_start - 1)*100):.0f}% increase). The growth patterns are pretty different.")
+    views.render_overview_tab(df, metrics)
 
-# Tab 2: CAGR Analysis
 with tab2:
-    st.write("### Comparing Growth Rates (CAGR)")
-    st.write("CAGR = Compound Annual Growth Rate, basically the steady rate needed to go from start to end value")
-    
-    fig, ax = plt.subplots(figsize=(10, 5))
-    
-    categories = ['Solar', 'Wind']
-    values = [solar_cagr, wind_cagr]
-    colors = ['#ff8c00', '#1f77b4']
-    
-    bars = ax.barh(categories, values, color=colors, alpha=0.7)
-    
-    # Add value labels
-    for i, (bar, value) in enumerate(zip(bars, values)):
-        ax.text(value + 0.3, i, f'{value:.2f}%', va='center', fontsize=12)
-    
-    ax.set_xlabel('CAGR (%)', fontsize=12)
-    ax.set_title(f'Growth Rate Comparison ({df["Year"].min()}-{df["Year"].max()})', fontsize=13)
-    ax.set_xlim(0, max(values) * 1.15)
-    ax.grid(True, alpha=0.3, axis='x')
-    
-    plt.tight_layout()
-    st.pyplot(fig)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.write("** Solar**")
-        st.write(f"CAGR: {solar_cagr:.2f}%")
-        st.write("Growing fast probably because solar panels keep getting cheaper. Makes sense that adoption would accelerate.")
-    
-    with col2:
-        st.write("** Wind**")
-        st.write(f"CAGR: {wind_cagr:.2f}%")
-        st.write("Slower growth rate but from a much bigger starting point. Wind has been around longer so less room for explosive growth.")
+    views.render_cagr_tab(df, metrics)
 
-# Tab 3: YoY Trends
 with tab3:
-    st.write("### Year-over-Year Growth")
-    st.write("How much did generation change each year compared to the previous year?")
-    
-    df_yoy = df[df['Year'] > df['Year'].min()].copy()
-    
-    fig, ax = plt.subplots(figsize=(12, 5))
-    
-    ax.plot(df_yoy['Year'], df_yoy['Solar_YoY_Growth'], 
-            marker='o', linewidth=2, label='Solar YoY %', 
-            color='#ff8c00', markersize=6)
-    ax.plot(df_yoy['Year'], df_yoy['Wind_YoY_Growth'], 
-            marker='s', linewidth=2, label='Wind YoY %', 
-            color='#1f77b4', markersize=6)
-    
-    ax.axhline(y=0, color='gray', linestyle='--', alpha=0.5, linewidth=1)
-    
-    ax.set_xlabel('Year', fontsize=12)
-    ax.set_ylabel('Growth Rate (%)', fontsize=12)
-    ax.set_title('Annual Growth Rate Changes', fontsize=13)
-    ax.legend(fontsize=11)
-    ax.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    st.pyplot(fig)
-    
-    st.write("You can see the volatility year-to-year. Some years solar jumped a lot, other years less so.")
-    
-    with st.expander("How I processed the data"):
-        st.write("""
-        **Data Processing Steps:**
-        1. Downloaded EIA data from Kaggle (organized_Gen.csv)
-        2. Filtered for "Total Electric Power Industry" only (to avoid double-counting)
-        3. Extracted rows where energy source contains "Solar" or "Wind"
-        4. Grouped by year and summed across all states
-        5. Converted from MWh to TWh (divided by 1,000,000)
-        6. Calculated year-over-year growth using Pandas `.pct_change()`
-        
-        **Tools:** Python, Pandas, NumPy, Matplotlib, Seaborn, Streamlit
-        """)
+    views.render_yoy_tab(df.iloc[1:])
 
-# Tab 4: Data Table
 with tab4:
-    st.write("### The Actual Numbers")
-    
-    # Format the dataframe for display
-    display_df = df.copy()
-    display_df['Solar_TWh'] = display_df['Solar_TWh'].round(1)
-    display_df['Wind_TWh'] = display_df['Wind_TWh'].round(1)
-    display_df['Total_Renewable'] = display_df['Total_Renewable'].round(1)
-    display_df['Solar_YoY_Growth'] = display_df['Solar_YoY_Growth'].round(2)
-    display_df['Wind_YoY_Growth'] = display_df['Wind_YoY_Growth'].round(2)
-    
-    st.dataframe(display_df, use_container_width=True)
-    
-    # Summary statistics
-    st.write("### Quick Stats")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.write("**Solar:**")
-        st.write(f"- Started at: {solar_start:.1f} TWh")
-        st.write(f"- Ended at: {solar_end:.1f} TWh")
-        st.write(f"- Total growth: {((solar_end - solar_start) / solar_start * 100):.0f}%")
-        st.write(f"- CAGR: {solar_cagr:.2f}%")
-    
-    with col2:
-        st.write("**Wind:**")
-        st.write(f"- Started at: {wind_start:.1f} TWh")
-        st.write(f"- Ended at: {wind_end:.1f} TWh")
-        st.write(f"- Total growth: {((wind_end - wind_start) / wind_start * 100):.0f}%")
-        st.write(f"- CAGR: {wind_cagr:.2f}%")
+    views.render_table_tab(df, metrics)
 
 # Footer Section
 st.write("---")
@@ -262,7 +225,7 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.write("**About the data:**")
-    st.write(f"Solar's {solar_cagr:.1f}% growth rate is way higher than wind's {wind_cagr:.1f}%. This makes sense - solar panels have gotten a lot cheaper in recent years, so more people and companies are installing them. Wind was already pretty established when this data period started.")
+    st.write(f"Solar's {fmt['solar_cagr_short']} growth rate is way higher than wind's {fmt['wind_cagr_short']}. This makes sense - solar panels have gotten a lot cheaper in recent years, so more people and companies are installing them. Wind was already pretty established when this data period started.")
     
 with col2:
     st.write("**Why this matters:**")
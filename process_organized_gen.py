@@ -1,56 +1,37 @@
-import pandas as pd
-import os
+import sys
+from dataclasses import replace
+
+import eia_pipeline
+from eia_pipeline import OUTPUT_PARQUET, load_cached_result, save_result
 
 # Load the data
 filepath = input("Enter path to organized_Gen.csv: ").strip().strip('"').strip("'")
-df = pd.read_csv(filepath)
-
-print("✅ File loaded!")
-print(f"Total rows: {len(df)}")
-
-# IMPORTANT: Filter for "Total Electric Power Industry" to avoid double-counting
-print("\nFiltering for total industry values only...")
-df = df[df['TYPE OF PRODUCER'] == 'Total Electric Power Industry']
-print(f"Filtered to {len(df)} rows (Total Electric Power Industry only)")
-
-# Now filter for Solar and Wind
-print("\nFiltering for Solar and Wind...")
 
-solar_df = df[df['ENERGY SOURCE'].str.contains('Solar', case=False, na=False)]
-print(f"Found {len(solar_df)} Solar rows")
+# Same cleaning as check_data.py, limited to 2014-2024
+schema = replace(eia_pipeline.SCHEMA, year_range=(2014, 2024))
 
-wind_df = df[df['ENERGY SOURCE'].str.contains('Wind', case=False, na=False)]
-print(f"Found {len(wind_df)} Wind rows")
+# Nothing to do if the source file hasn't changed since the last run
+result = load_cached_result(filepath, schema)
+if result is not None:
+    print(f"✅ Source file unchanged, using cached result: {OUTPUT_PARQUET}")
+    print(result)
+    sys.exit()
 
-if len(solar_df) > 0:
-    print(f"\nSolar energy sources: {solar_df['ENERGY SOURCE'].unique()}")
-if len(wind_df) > 0:
-    print(f"Wind energy sources: {wind_df['ENERGY SOURCE'].unique()}")
+# IMPORTANT: Filter for "Total Electric Power Industry" to avoid double-counting
+# Then keep only Solar and Wind (both done while loading, see eia_pipeline.py)
+print("\nFiltering for Solar and Wind (Total Electric Power Industry only)...")
+eia_pipeline.inspect(filepath, schema)
 
-# Group by year and sum generation
+# Group by year and sum generation (reuses the rows loaded above)
 print("\nAggregating by year...")
-
-solar_yearly = solar_df.groupby('YEAR')['GENERATION (Megawatthours)'].sum()
-wind_yearly = wind_df.groupby('YEAR')['GENERATION (Megawatthours)'].sum()
-
-# Create final dataframe
-result = pd.DataFrame({
-    'Year': solar_yearly.index,
-    'Solar_TWh': solar_yearly.values / 1000000,
-    'Wind_TWh': wind_yearly.values / 1000000
-})
-
-# Filter to 2014-2024
-result = result[(result['Year'] >= 2014) & (result['Year'] <= 2024)]
-result = result.sort_values('Year').reset_index(drop=True)
+result = eia_pipeline.build(filepath, schema)
 
 print(f"\n✅ Processed data (2014-2024):")
 print(result)
 print("\nExpected: Solar ~18-188 TWh, Wind ~180-450 TWh")
 
 # Save
-os.makedirs('data', exist_ok=True)
-result.to_csv('data/eia_renewable_data.csv', index=False)
+save_result(result, filepath, schema)
 
-print(f"\n✅ SUCCESS! Saved to: data/eia_renewable_data.csv")
-print("\nNow run: streamlit run energy_analysis_app.py")
\ No newline at end of file
+print(f"\n✅ SUCCESS! Saved to: data/eia_renewable_data.csv and data/eia_renewable_data.parquet")
+print("\nNow run: streamlit run energy_app.py")
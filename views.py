@@ -0,0 +1,255 @@
+"""
+Tab contents for energy_app.py
+Each tab is a function, so the app computes its metrics once and hands them to every tab
+"""
+
+import functools
+import io
+
+import numpy as np
+import streamlit as st
+
+# Chart style, applied once when matplotlib is first loaded, so the chart builders don't
+# restyle every figure themselves: matplotlib's copy of seaborn's "whitegrid" look (no seaborn
+# import needed), with a lighter grid and constrained layout on top
+CHART_STYLE = [
+    'seaborn-v0_8-whitegrid',
+    {
+        'grid.alpha': 0.3,
+        'figure.constrained_layout.use': True,
+    },
+]
+
+# CHARTS
+# Charts are rendered to PNG once per input and cached, so reruns skip matplotlib entirely
+# Figures are built with matplotlib's object-oriented API and drawn by Agg directly, so pyplot
+# never registers them and nothing piles up across reruns
+@functools.cache
+def load_matplotlib():
+    """Import matplotlib on first use (it's slow to import) and apply the chart style"""
+    import matplotlib
+    # Charts are only ever drawn to PNG, so pin the Agg backend instead of probing for a GUI one
+    matplotlib.use('Agg')
+    from matplotlib import font_manager, style
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    style.use(CHART_STYLE)
+    # Load the font cache now rather than partway through drawing the first chart
+    font_manager.findfont(font_manager.FontProperties())
+    return Figure, FigureCanvasAgg
+
+def new_figure(figsize):
+    """Empty figure with one set of axes"""
+    Figure, FigureCanvasAgg = load_matplotlib()
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
+
+def lttb(x, y, n_out=1000):
+    """
+    Downsample a line to at most n_out points with Largest-Triangle-Three-Buckets
+
+    Keeps the first and last points, and from each bucket in between the point that forms the
+    largest triangle with the last kept point and the next bucket's average, so peaks and dips
+    survive. Lines that are already short enough are returned as they are.
+
+    Args:
+        x: X values, in plotting order
+        y: Y values
+        n_out: Maximum number of points to draw
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return x, y
+
+    # Split the points between the first and last into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        a = keep[i]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        keep[i + 1] = start + np.argmax(area)
+
+    return x[keep], y[keep]
+
+# Line charts go through lttb() first, so drawing time stays bounded however many points
+# the processed data has (one per year today, more if it's ever kept monthly)
+def make_generation_fig(df):
+    """Line chart of solar, wind and total generation over time"""
+    fig, ax = new_figure((12, 6))
+
+    # Plot lines
+    ax.plot(*lttb(df['Year'], df['Solar_TWh']), marker='o', linewidth=3,
+            label='Solar', color='#ff8c00', markersize=8)
+    ax.plot(*lttb(df['Year'], df['Wind_TWh']), marker='s', linewidth=3,
+            label='Wind', color='#1f77b4', markersize=8)
+    ax.plot(*lttb(df['Year'], df['Total_Renewable']), marker='^', linewidth=2,
+            label='Total Renewable', color='#2ca02c', markersize=6,
+            linestyle='--', alpha=0.7)
+
+    # Styling
+    ax.set_xlabel('Year', fontsize=12)
+    ax.set_ylabel('Energy Generation (TWh)', fontsize=12)
+    ax.set_title('Solar vs Wind Generation', fontsize=14, pad=15)
+    ax.legend(fontsize=11, loc='upper left')
+
+    return fig
+
+def make_cagr_fig(solar_cagr, wind_cagr, start_year, end_year):
+    """Horizontal bar chart comparing solar and wind CAGR"""
+    fig, ax = new_figure((10, 5))
+
+    categories = ['Solar', 'Wind']
+    values = [solar_cagr, wind_cagr]
+    colors = ['#ff8c00', '#1f77b4']
+
+    bars = ax.barh(categories, values, color=colors, alpha=0.7)
+
+    # Add value labels
+    for i, (bar, value) in enumerate(zip(bars, values)):
+        ax.text(value + 0.3, i, f'{value:.2f}%', va='center', fontsize=12)
+
+    ax.set_xlabel('CAGR (%)', fontsize=12)
+    ax.set_title(f'Growth Rate Comparison ({start_year}-{end_year})', fontsize=13)
+    ax.set_xlim(0, max(values) * 1.15)
+
+    return fig
+
+def make_yoy_fig(df_yoy):
+    """Line chart of year-over-year growth for solar and wind"""
+    fig, ax = new_figure((12, 5))
+
+    ax.plot(*lttb(df_yoy['Year'], df_yoy['Solar_YoY_Growth']),
+            marker='o', linewidth=2, label='Solar YoY %',
+            color='#ff8c00', markersize=6)
+    ax.plot(*lttb(df_yoy['Year'], df_yoy['Wind_YoY_Growth']),
+            marker='s', linewidth=2, label='Wind YoY %',
+            color='#1f77b4', markersize=6)
+
+    ax.axhline(y=0, color='gray', linestyle='--', alpha=0.5, linewidth=1)
+
+    ax.set_xlabel('Year', fontsize=12)
+    ax.set_ylabel('Growth Rate (%)', fontsize=12)
+    ax.set_title('Annual Growth Rate Changes', fontsize=13)
+    ax.legend(fontsize=11)
+
+    return fig
+
+CHART_BUILDERS = {
+    'generation': make_generation_fig,
+    'cagr': make_cagr_fig,
+    'yoy': make_yoy_fig,
+}
+
+# Cached as a resource: the PNG bytes are immutable, so every rerun can share the same
+# object instead of st.cache_data unpickling a fresh copy of each image
+@st.cache_resource(show_spinner=False)
+def render_png(chart, *args):
+    """Render one of CHART_BUILDERS to PNG bytes"""
+    fig = CHART_BUILDERS[chart](*args)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=200, bbox_inches='tight')
+    return buffer.getvalue()
+
+# TABS
+# Tab 1: Generation Overview
+def render_overview_tab(df, metrics):
+    """Generation over time, with the start/end totals from metrics"""
+    fmt = metrics['fmt']
+
+    st.write("### Energy Generation Trends")
+    start_year, end_year = metrics['years']
+    st.write(f"Looking at how solar and wind generation changed from {start_year} to {end_year}")
+
+    st.image(render_png('generation', df))
+
+    st.write(f"**Note:** Solar grew from {fmt['solar_start']} TWh to {fmt['solar_end']} TWh (a {fmt['solar_growth']} increase), while wind went from {fmt['wind_start']} TWh to {fmt['wind_end']} TWh ({fmt['wind_growth']} increase). The growth patterns are pretty different.")
+
+# Tab 2: CAGR Analysis
+def render_cagr_tab(df, metrics):
+    """CAGR bar chart and a short note on each source"""
+    solar_cagr, wind_cagr = metrics['cagr']
+    fmt = metrics['fmt']
+
+    st.write("### Comparing Growth Rates (CAGR)")
+    st.write("CAGR = Compound Annual Growth Rate, basically the steady rate needed to go from start to end value")
+
+    if metrics['num_years'] == 0:
+        st.info("CAGR needs at least two years of data.")
+    elif not np.isfinite(metrics['cagr']).all():
+        st.info("CAGR is undefined when generation starts at zero.")
+    else:
+        st.image(render_png('cagr', solar_cagr, wind_cagr, *metrics['years']))
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.write("** Solar**")
+        st.write(f"CAGR: {fmt['solar_cagr']}")
+        st.write("Growing fast probably because solar panels keep getting cheaper. Makes sense that adoption would accelerate.")
+
+    with col2:
+        st.write("** Wind**")
+        st.write(f"CAGR: {fmt['wind_cagr']}")
+        st.write("Slower growth rate but from a much bigger starting point. Wind has been around longer so less room for explosive growth.")
+
+# Tab 3: YoY Trends
+def render_yoy_tab(df_yoy):
+    """Year-over-year growth chart and how the data was processed"""
+    st.write("### Year-over-Year Growth")
+    st.write("How much did generation change each year compared to the previous year?")
+
+    st.image(render_png('yoy', df_yoy))
+
+    st.write("You can see the volatility year-to-year. Some years solar jumped a lot, other years less so.")
+
+    with st.expander("How I processed the data"):
+        st.write("""
+        **Data Processing Steps:**
+        1. Downloaded EIA data from Kaggle (organized_Gen.csv)
+        2. Filtered for "Total Electric Power Industry" only (to avoid double-counting)
+        3. Extracted rows where energy source contains "Solar" or "Wind"
+        4. Grouped by year and summed across all states
+        5. Converted from MWh to TWh (divided by 1,000,000)
+        6. Calculated year-over-year growth with NumPy
+
+        **Tools:** Python, Pandas, NumPy, Matplotlib, Streamlit
+        """)
+
+# Tab 4: Data Table
+def render_table_tab(df, metrics):
+    """The data table plus quick stats for each source"""
+    st.write("### The Actual Numbers")
+
+    # Format the numbers for display only (the data itself isn't copied or rounded)
+    display_formats = {
+        'Solar_TWh': '{:.1f}',
+        'Wind_TWh': '{:.1f}',
+        'Total_Renewable': '{:.1f}',
+        'Solar_YoY_Growth': '{:.2f}',
+        'Wind_YoY_Growth': '{:.2f}',
+    }
+    st.dataframe(df.style.format(display_formats, na_rep=''), use_container_width=True)
+
+    # Summary statistics - same stats for each series, taken from the precomputed metrics
+    st.write("### Quick Stats")
+
+    fmt = metrics['fmt']
+    for col, name in zip(st.columns(2), ['Solar', 'Wind']):
+        key = name.lower()
+        with col:
+            st.write(f"**{name}:**")
+            st.write(f"- Started at: {fmt[f'{key}_start']} TWh")
+            st.write(f"- Ended at: {fmt[f'{key}_end']} TWh")
+            st.write(f"- Total growth: {fmt[f'{key}_growth']}")
+            st.write(f"- CAGR: {fmt[f'{key}_cagr']}")